@@ -1,23 +1,82 @@
+import hashlib
 import traceback
+from typing import Optional
 
-from fastapi import APIRouter, UploadFile, File, HTTPException
+from fastapi import APIRouter, UploadFile, File, HTTPException, Header, Response
 
-from informed_be.workflows.ingredient_graph import analyze_ingredients
+from informed_be.db import record_ingredient_hits
+from informed_be.workflows.ingredient_graph import analyze_ingredients, lookup_analysis_by_hash
+from informed_be.metrics import ANALYSIS_LOOKUPS
 from informed_be.models.schemas import AnalysisResult
 
 router = APIRouter()
 
+
+def _etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    if not if_none_match:
+        return False
+    candidates = [tag.strip().removeprefix("W/") for tag in if_none_match.split(",")]
+    return "*" in candidates or etag in candidates
+
+
 @router.post("/analyze", response_model=AnalysisResult)
-async def analyze_image(file: UploadFile = File(...)) -> AnalysisResult:
+async def analyze_image(
+    response: Response,
+    file: UploadFile = File(...),
+    if_none_match: Optional[str] = Header(default=None),
+) -> AnalysisResult:
     try:
         image_bytes = await file.read()
 
         if not image_bytes:
             raise HTTPException(status_code=400, detail="Empty file received")
 
-        return analyze_ingredients(image_bytes)
+        image_hash = hashlib.sha256(image_bytes).hexdigest()
+        response.headers["X-Image-Hash"] = image_hash
+
+        cached = lookup_analysis_by_hash(image_hash)
+        if cached is not None:
+            result, etag = cached
+            if _etag_matches(if_none_match, etag):
+                ANALYSIS_LOOKUPS.labels(endpoint="analyze", outcome="not_modified").inc()
+                return Response(status_code=304, headers={"ETag": etag, "X-Image-Hash": image_hash})
+            ANALYSIS_LOOKUPS.labels(endpoint="analyze", outcome="hit").inc()
+            record_ingredient_hits(list(result["assessments"]))
+            response.headers["ETag"] = etag
+            return result
+
+        ANALYSIS_LOOKUPS.labels(endpoint="analyze", outcome="miss").inc()
+        result = analyze_ingredients(image_bytes, image_hash)
+        if result["status"] == "complete":
+            rebuilt = lookup_analysis_by_hash(image_hash)
+            if rebuilt is not None:
+                response.headers["ETag"] = rebuilt[1]
+        return result
     except HTTPException as he:
         raise he
     except Exception as e:
         traceback.print_exc()
         raise HTTPException(status_code=500, detail=f"Processing error: {str(e)}")
+
+
+@router.get("/results/{image_hash}", response_model=AnalysisResult)
+async def get_result(
+    image_hash: str,
+    response: Response,
+    if_none_match: Optional[str] = Header(default=None),
+) -> AnalysisResult:
+    """Return a previous analysis by the SHA-256 of the uploaded image, so clients can skip re-uploading."""
+    cached = lookup_analysis_by_hash(image_hash.lower())
+    if cached is None:
+        ANALYSIS_LOOKUPS.labels(endpoint="results", outcome="miss").inc()
+        raise HTTPException(status_code=404, detail="No analysis found for this image hash")
+
+    result, etag = cached
+    if _etag_matches(if_none_match, etag):
+        ANALYSIS_LOOKUPS.labels(endpoint="results", outcome="not_modified").inc()
+        return Response(status_code=304, headers={"ETag": etag})
+
+    ANALYSIS_LOOKUPS.labels(endpoint="results", outcome="hit").inc()
+    record_ingredient_hits(list(result["assessments"]))
+    response.headers["ETag"] = etag
+    return result
@@ -10,6 +10,25 @@ class Settings(BaseSettings):
     OCR_LANGUAGE: str
     OCR_CONFIDENCE_THRESHOLD: float
     DATABASE_URL: str
+    LLM_CACHE_TTL_SECONDS: int = 7 * 24 * 3600
+    LLM_CACHE_MAX_ENTRIES: int = 1024
+    GROQ_TIMEOUT_SECONDS: float = 20.0
+    GROQ_DEADLINE_SECONDS: float = 45.0
+    GROQ_MAX_RETRIES: int = 3
+    GROQ_BACKOFF_BASE_SECONDS: float = 0.5
+    GROQ_BACKOFF_MAX_SECONDS: float = 8.0
+    GROQ_REQUESTS_PER_MINUTE: int = 30
+    GROQ_BREAKER_FAILURE_THRESHOLD: int = 5
+    GROQ_BREAKER_RESET_SECONDS: float = 30.0
+    ASSESS_LATENCY_BUDGET_SECONDS: float = 10.0
+    ASSESS_BACKGROUND_WORKERS: int = 4
+    CACHE_MAINTENANCE_ENABLED: bool = True
+    CACHE_MAINTENANCE_INTERVAL_SECONDS: float = 300.0
+    CACHE_REFRESH_BATCH_SIZE: int = 20
+    CACHE_REFRESH_MAX_BATCHES: int = 3
+    CACHE_UNKNOWN_RETRY_SECONDS: float = 24 * 3600
+    CACHE_EVICT_IDLE_DAYS: int = 90
+    CACHE_EVICT_MIN_HITS: int = 3
 
     class Config:
         env_file = f"src/config/{os.getenv('APP_ENV', 'dev')}.env"
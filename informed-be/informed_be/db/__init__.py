@@ -1 +1,7 @@
-from .db import save_to_db, lookup_assessments_by_names
\ No newline at end of file
+from .db import (
+    save_to_db, lookup_assessments_by_names,
+    lookup_llm_response, save_llm_response,
+    lookup_analysis, save_analysis, delete_analysis,
+    record_ingredient_hits, flush_ingredient_hits, find_stale_ingredients, update_refreshed_ingredients,
+    evict_ingredients, purge_expired_llm_responses,
+)
\ No newline at end of file
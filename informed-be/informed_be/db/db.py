@@ -1,6 +1,10 @@
-from typing import Dict, List
+import json
+import threading
+from collections import Counter as TallyCounter
+from datetime import datetime, timedelta, timezone
+from typing import Dict, List, Optional, Tuple
 
-from sqlalchemy import Column, Integer, String, DateTime, func, create_engine
+from sqlalchemy import Column, Float, Integer, String, Text, DateTime, and_, func, create_engine, or_, text
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker
 
@@ -23,25 +27,86 @@ class IngredientDB(Base):
     name = Column(String, unique=True, nullable=False)
     rating = Column(String, nullable=False)
     reason = Column(String, nullable=False)
+    version = Column(Integer, nullable=False, default=1, server_default="1")
+    model = Column(String, nullable=True)
+    prompt_version = Column(Integer, nullable=True)
+    hit_count = Column(Integer, nullable=False, default=0, server_default="0")
+    last_accessed_at = Column(DateTime(timezone=True), nullable=True, index=True)
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
+    updated_at = Column(DateTime(timezone=True), nullable=True)
+
+
+class LLMResponseDB(Base):
+    __tablename__ = "llm_responses"
+    id = Column(Integer, primary_key=True)
+    cache_key = Column(String(64), unique=True, nullable=False)
+    model = Column(String, nullable=False)
+    content = Column(Text, nullable=False)
+    latency_seconds = Column(Float, nullable=False, default=0.0)
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
+    expires_at = Column(DateTime(timezone=True), nullable=False, index=True)
+
+
+
+class AnalysisDB(Base):
+    __tablename__ = "analyses"
+    id = Column(Integer, primary_key=True)
+    image_hash = Column(String(64), unique=True, nullable=False)
+    ingredient_names = Column(Text, nullable=False)
     created_at = Column(DateTime(timezone=True), server_default=func.now())
 
 Base.metadata.create_all(bind=engine)
 
-def save_to_db(assessments: Dict[str, Assessment]):
+# create_all() only creates missing tables; columns added to existing tables are applied here.
+_COLUMN_MIGRATIONS = [
+    "ALTER TABLE ingredients ADD COLUMN IF NOT EXISTS version INTEGER NOT NULL DEFAULT 1",
+    "ALTER TABLE ingredients ADD COLUMN IF NOT EXISTS model VARCHAR",
+    "ALTER TABLE ingredients ADD COLUMN IF NOT EXISTS prompt_version INTEGER",
+    "ALTER TABLE ingredients ADD COLUMN IF NOT EXISTS hit_count INTEGER NOT NULL DEFAULT 0",
+    "ALTER TABLE ingredients ADD COLUMN IF NOT EXISTS last_accessed_at TIMESTAMP WITH TIME ZONE",
+    "ALTER TABLE ingredients ADD COLUMN IF NOT EXISTS updated_at TIMESTAMP WITH TIME ZONE",
+    "CREATE INDEX IF NOT EXISTS ix_ingredients_last_accessed_at ON ingredients (last_accessed_at)",
+]
+
+# Ingredient cache hits are tallied in memory and written in batches by
+# flush_ingredient_hits() rather than with an UPDATE on every request.
+_pending_hits: TallyCounter = TallyCounter()
+_pending_hits_lock = threading.Lock()
+
+with engine.begin() as connection:
+    for statement in _COLUMN_MIGRATIONS:
+        connection.execute(text(statement))
+
+def save_to_db(assessments: Dict[str, Assessment], prompt_version: Optional[int] = None):
+    """Store new assessments; 'unknown' ratings are never stored and existing 'unknown' rows are replaced."""
     DB_QUERIES.labels(operation="write").inc()
     session = SessionLocal()
     try:
         with DB_QUERY_DURATION.labels(operation="write").time():
             for name, assessment in assessments.items():
+                if assessment.rating == "unknown":
+                    logger.debug(f"Skipping {name}: no usable assessment")
+                    continue
                 normalized_name = name.lower().strip()
                 existing = session.query(IngredientDB).filter_by(name=normalized_name).first()
+                if existing and existing.rating == "unknown":
+                    existing.rating = assessment.rating
+                    existing.reason = assessment.reason
+                    existing.version = existing.version + 1
+                    existing.model = settings.MODEL
+                    existing.prompt_version = prompt_version
+                    existing.updated_at = datetime.now(timezone.utc)
+                    logger.debug(f"Replaced unknown assessment for {normalized_name}")
+                    continue
                 if existing:
                     logger.debug(f"Skipping {name}: already exists in database")
                     continue
                 db_item = IngredientDB(
                     name=normalized_name,
                     rating=assessment.rating,
-                    reason=assessment.reason
+                    reason=assessment.reason,
+                    model=settings.MODEL,
+                    prompt_version=prompt_version
                 )
                 session.add(db_item)
                 logger.debug(f"Added {normalized_name} to session")
@@ -54,7 +119,8 @@ def save_to_db(assessments: Dict[str, Assessment]):
     finally:
         session.close()
 
-def lookup_assessments_by_names(names: List[str]) -> Dict[str, IngredientDB]:
+def lookup_assessments_by_names(names: List[str], track_hits: bool = False) -> Dict[str, IngredientDB]:
+    """Cached rows by requested name; with track_hits, found rows count as used for eviction."""
     logger.debug("Starting lookup_assessments_by_names")
     DB_QUERIES.labels(operation="read").inc()
     session = SessionLocal()
@@ -71,6 +137,8 @@ def lookup_assessments_by_names(names: List[str]) -> Dict[str, IngredientDB]:
                 else:
                     logger.debug(f"No assessment found for {name}")
         logger.debug("Completed lookup_assessments_by_names")
+        if track_hits:
+            record_ingredient_hits([row.name for row in assessments.values()])
         return assessments
     except Exception as e:
         DB_ERRORS.labels(operation="read").inc()
@@ -78,3 +146,252 @@ def lookup_assessments_by_names(names: List[str]) -> Dict[str, IngredientDB]:
         return assessments
     finally:
         session.close()
+
+def lookup_llm_response(cache_key: str) -> Optional[Tuple[str, float]]:
+    """Return (content, latency_seconds) for an unexpired cached LLM response, if any."""
+    DB_QUERIES.labels(operation="read").inc()
+    session = SessionLocal()
+    try:
+        with DB_QUERY_DURATION.labels(operation="read").time():
+            row = (
+                session.query(LLMResponseDB)
+                .filter(LLMResponseDB.cache_key == cache_key)
+                .filter(LLMResponseDB.expires_at > datetime.now(timezone.utc))
+                .first()
+            )
+        if row is None:
+            return None
+        return row.content, row.latency_seconds
+    except Exception as e:
+        DB_ERRORS.labels(operation="read").inc()
+        logger.error(f"LLM response lookup failed: {str(e)}")
+        return None
+    finally:
+        session.close()
+
+def save_llm_response(cache_key: str, model: str, content: str, latency_seconds: float, ttl_seconds: int):
+    """Insert or refresh a cached LLM response, replacing any expired entry for the key."""
+    DB_QUERIES.labels(operation="write").inc()
+    session = SessionLocal()
+    try:
+        expires_at = datetime.now(timezone.utc) + timedelta(seconds=ttl_seconds)
+        with DB_QUERY_DURATION.labels(operation="write").time():
+            existing = session.query(LLMResponseDB).filter_by(cache_key=cache_key).first()
+            if existing:
+                existing.content = content
+                existing.latency_seconds = latency_seconds
+                existing.expires_at = expires_at
+            else:
+                session.add(LLMResponseDB(
+                    cache_key=cache_key,
+                    model=model,
+                    content=content,
+                    latency_seconds=latency_seconds,
+                    expires_at=expires_at
+                ))
+            session.commit()
+        logger.debug(f"Saved LLM response {cache_key[:12]} to database")
+    except Exception as e:
+        DB_ERRORS.labels(operation="write").inc()
+        session.rollback()
+        logger.error(f"LLM response save failed: {str(e)}")
+    finally:
+        session.close()
+
+def lookup_analysis(image_hash: str) -> Optional[List[str]]:
+    """Return the ingredient names recorded for a previously analyzed image, if any."""
+    DB_QUERIES.labels(operation="read").inc()
+    session = SessionLocal()
+    try:
+        with DB_QUERY_DURATION.labels(operation="read").time():
+            row = session.query(AnalysisDB).filter_by(image_hash=image_hash).first()
+        return json.loads(row.ingredient_names) if row else None
+    except Exception as e:
+        DB_ERRORS.labels(operation="read").inc()
+        logger.error(f"Analysis lookup failed: {str(e)}")
+        return None
+    finally:
+        session.close()
+
+def save_analysis(image_hash: str, ingredient_names: List[str]):
+    DB_QUERIES.labels(operation="write").inc()
+    session = SessionLocal()
+    try:
+        with DB_QUERY_DURATION.labels(operation="write").time():
+            existing = session.query(AnalysisDB).filter_by(image_hash=image_hash).first()
+            if existing:
+                existing.ingredient_names = json.dumps(ingredient_names)
+            else:
+                session.add(AnalysisDB(image_hash=image_hash, ingredient_names=json.dumps(ingredient_names)))
+            session.commit()
+        logger.debug(f"Saved analysis {image_hash[:12]} with {len(ingredient_names)} ingredients")
+    except Exception as e:
+        DB_ERRORS.labels(operation="write").inc()
+        session.rollback()
+        logger.error(f"Analysis save failed: {str(e)}")
+    finally:
+        session.close()
+
+def delete_analysis(image_hash: str):
+    DB_QUERIES.labels(operation="write").inc()
+    session = SessionLocal()
+    try:
+        with DB_QUERY_DURATION.labels(operation="write").time():
+            session.query(AnalysisDB).filter_by(image_hash=image_hash).delete(synchronize_session=False)
+            session.commit()
+        logger.debug(f"Deleted analysis {image_hash[:12]}")
+    except Exception as e:
+        DB_ERRORS.labels(operation="write").inc()
+        session.rollback()
+        logger.error(f"Analysis delete failed: {str(e)}")
+    finally:
+        session.close()
+
+def record_ingredient_hits(names: List[str]) -> None:
+    """Buffer a hit for each name; names without a cached row are ignored when flushed."""
+    with _pending_hits_lock:
+        _pending_hits.update(name.lower().strip() for name in names)
+
+def flush_ingredient_hits() -> int:
+    """Write buffered ingredient hit counts and access times in one batch; returns names flushed."""
+    with _pending_hits_lock:
+        hits = dict(_pending_hits)
+        _pending_hits.clear()
+    if not hits:
+        return 0
+
+    DB_QUERIES.labels(operation="write").inc()
+    session = SessionLocal()
+    try:
+        with DB_QUERY_DURATION.labels(operation="write").time():
+            session.execute(
+                text("UPDATE ingredients SET hit_count = hit_count + :hits, last_accessed_at = now() WHERE name = :name"),
+                [{"name": name, "hits": count} for name, count in hits.items()],
+            )
+            session.commit()
+        return len(hits)
+    except Exception as e:
+        DB_ERRORS.labels(operation="write").inc()
+        session.rollback()
+        logger.error(f"Hit count flush failed: {str(e)}")
+        return 0
+    finally:
+        session.close()
+
+def find_stale_ingredients(prompt_version: int, unknown_retry_seconds: float, limit: int) -> List[str]:
+    """Names of rows assessed by another model/prompt or rated 'unknown', most used first.
+
+    Rows whose last refresh attempt left them stale are retried only after unknown_retry_seconds.
+    """
+    DB_QUERIES.labels(operation="read").inc()
+    session = SessionLocal()
+    try:
+        retry_before = datetime.now(timezone.utc) - timedelta(seconds=unknown_retry_seconds)
+        with DB_QUERY_DURATION.labels(operation="read").time():
+            rows = (
+                session.query(IngredientDB.name)
+                .filter(or_(
+                    and_(
+                        or_(
+                            IngredientDB.model.is_distinct_from(settings.MODEL),
+                            IngredientDB.prompt_version.is_distinct_from(prompt_version),
+                        ),
+                        or_(IngredientDB.updated_at.is_(None), IngredientDB.updated_at < retry_before),
+                    ),
+                    and_(
+                        IngredientDB.rating == "unknown",
+                        func.coalesce(IngredientDB.updated_at, IngredientDB.created_at) < retry_before,
+                    ),
+                ))
+                .order_by(IngredientDB.hit_count.desc())
+                .limit(limit)
+                .all()
+            )
+        return [row.name for row in rows]
+    except Exception as e:
+        DB_ERRORS.labels(operation="read").inc()
+        logger.error(f"Stale ingredient lookup failed: {str(e)}")
+        return []
+    finally:
+        session.close()
+
+def update_refreshed_ingredients(names: List[str], assessments: Dict[str, Assessment], prompt_version: int) -> int:
+    """Store re-assessments for names, bumping their version and stamping the current model/prompt.
+
+    Names without a usable new assessment keep their old stamp and only get
+    updated_at, which backs off their next retry.
+
+    Returns the number of rows whose assessment changed.
+    """
+    refreshed = {name.lower().strip(): assessment for name, assessment in assessments.items()}
+    DB_QUERIES.labels(operation="write").inc()
+    session = SessionLocal()
+    try:
+        changed = 0
+        now = datetime.now(timezone.utc)
+        with DB_QUERY_DURATION.labels(operation="write").time():
+            rows = session.query(IngredientDB).filter(IngredientDB.name.in_(names)).all()
+            for row in rows:
+                assessment = refreshed.get(row.name)
+                usable = assessment is not None and assessment.rating != "unknown"
+                if usable and (assessment.rating, assessment.reason) != (row.rating, row.reason):
+                    row.rating = assessment.rating
+                    row.reason = assessment.reason
+                    row.version = row.version + 1
+                    changed += 1
+                if usable:
+                    row.model = settings.MODEL
+                    row.prompt_version = prompt_version
+                row.updated_at = now
+            session.commit()
+        return changed
+    except Exception as e:
+        DB_ERRORS.labels(operation="write").inc()
+        session.rollback()
+        logger.error(f"Refreshed ingredient save failed: {str(e)}")
+        return 0
+    finally:
+        session.close()
+
+def evict_ingredients(idle_days: int, min_hits: int) -> int:
+    """Delete rows with fewer than min_hits that have not been accessed for idle_days."""
+    DB_QUERIES.labels(operation="write").inc()
+    session = SessionLocal()
+    try:
+        idle_before = datetime.now(timezone.utc) - timedelta(days=idle_days)
+        with DB_QUERY_DURATION.labels(operation="write").time():
+            deleted = (
+                session.query(IngredientDB)
+                .filter(IngredientDB.hit_count < min_hits)
+                .filter(func.coalesce(IngredientDB.last_accessed_at, IngredientDB.created_at) < idle_before)
+                .delete(synchronize_session=False)
+            )
+            session.commit()
+        return deleted
+    except Exception as e:
+        DB_ERRORS.labels(operation="write").inc()
+        session.rollback()
+        logger.error(f"Ingredient eviction failed: {str(e)}")
+        return 0
+    finally:
+        session.close()
+
+def purge_expired_llm_responses() -> int:
+    DB_QUERIES.labels(operation="write").inc()
+    session = SessionLocal()
+    try:
+        with DB_QUERY_DURATION.labels(operation="write").time():
+            deleted = (
+                session.query(LLMResponseDB)
+                .filter(LLMResponseDB.expires_at <= datetime.now(timezone.utc))
+                .delete(synchronize_session=False)
+            )
+            session.commit()
+        return deleted
+    except Exception as e:
+        DB_ERRORS.labels(operation="write").inc()
+        session.rollback()
+        logger.error(f"LLM response purge failed: {str(e)}")
+        return 0
+    finally:
+        session.close()
@@ -1,17 +1,30 @@
+from contextlib import asynccontextmanager
+
 from fastapi import FastAPI
 from prometheus_fastapi_instrumentator import Instrumentator
 
 from informed_be.api.routes import router
 from informed_be.config.settings import settings
 from informed_be.config.logging import setup_logging
+from informed_be.workflows.cache_maintenance import cache_maintenance
 
 setup_logging()
 
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    if settings.CACHE_MAINTENANCE_ENABLED:
+        cache_maintenance.start()
+    yield
+    cache_maintenance.stop()
+
+
 app = FastAPI(
     title="Ingredient Health Analyzer API",
     description="Backend API for analyzing food ingredients from images",
     version="0.1.0",
-    debug=settings.DEBUG
+    debug=settings.DEBUG,
+    lifespan=lifespan
 )
 
 app.include_router(router, prefix="/api")
@@ -1,4 +1,4 @@
-from prometheus_client import Counter, Histogram
+from prometheus_client import Counter, Gauge, Histogram
 
 GROQ_API_CALLS = Counter(
     "groq_api_calls_total",
@@ -62,3 +62,90 @@ DB_QUERY_DURATION = Histogram(
     labelnames=["operation"],
     buckets=[0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0],
 )
+
+LLM_CACHE_HITS = Counter(
+    "llm_response_cache_hits_total",
+    "Number of LLM prompts answered from the response cache",
+    labelnames=["node", "layer"],
+)
+
+LLM_CACHE_MISSES = Counter(
+    "llm_response_cache_misses_total",
+    "Number of LLM prompts NOT found in the response cache (requires LLM call)",
+    labelnames=["node"],
+)
+
+LLM_CACHE_SAVED_SECONDS = Counter(
+    "llm_response_cache_saved_seconds_total",
+    "LLM latency avoided by serving responses from the cache",
+    labelnames=["node"],
+)
+
+RULE_CLASSIFIER_MATCHES = Counter(
+    "rule_classifier_matches_total",
+    "Number of ingredients assessed by the local rule-based classifier",
+)
+
+RULE_CLASSIFIER_LLM_CALLS_AVOIDED = Counter(
+    "rule_classifier_llm_calls_avoided_total",
+    "Number of Groq assess calls avoided because the rule-based classifier covered every cache miss",
+)
+
+GROQ_API_RETRIES = Counter(
+    "groq_api_retries_total",
+    "Number of Groq LLM API calls retried after a retryable error",
+    labelnames=["error_type"],
+)
+
+GROQ_THROTTLE_WAIT = Histogram(
+    "groq_throttle_wait_seconds",
+    "Time spent waiting on the local rate limiter before calling Groq",
+    buckets=[0.0, 0.1, 0.5, 1.0, 2.0, 5.0, 10.0, 30.0],
+)
+
+GROQ_CIRCUIT_STATE = Gauge(
+    "groq_circuit_breaker_state",
+    "Groq circuit breaker state (0=closed, 1=half-open, 2=open)",
+)
+
+GROQ_CIRCUIT_REJECTIONS = Counter(
+    "groq_circuit_breaker_rejections_total",
+    "Number of Groq calls rejected fast because the circuit breaker was open",
+)
+
+DEGRADED_RESPONSES = Counter(
+    "assess_degraded_responses_total",
+    "Number of analyses returned without LLM assessments for some ingredients",
+    labelnames=["reason"],
+)
+
+BACKGROUND_ASSESSMENTS = Counter(
+    "assess_background_completions_total",
+    "Number of LLM assessments finished in the background after the latency budget expired",
+    labelnames=["outcome"],
+)
+
+ANALYSIS_LOOKUPS = Counter(
+    "analysis_result_lookups_total",
+    "Lookups of previous analysis results by image hash",
+    labelnames=["endpoint", "outcome"],
+)
+
+INGREDIENT_REFRESHES = Counter(
+    "ingredient_cache_refreshes_total",
+    "Stale ingredient assessments re-assessed by the background refresher",
+    labelnames=["outcome"],
+)
+
+CACHE_EVICTIONS = Counter(
+    "cache_evictions_total",
+    "Rows removed by cache maintenance",
+    labelnames=["table"],
+)
+
+CACHE_MAINTENANCE_DURATION = Histogram(
+    "cache_maintenance_duration_seconds",
+    "Time spent on background cache maintenance tasks",
+    labelnames=["task"],
+    buckets=[0.01, 0.05, 0.1, 0.5, 1.0, 5.0, 10.0, 30.0, 60.0],
+)
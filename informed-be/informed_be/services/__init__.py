@@ -1 +1,4 @@
 from .ocr_service import OCRService
+from .llm_cache import llm_response_cache, make_cache_key
+from .ingredient_rules import IngredientRules
+from .llm_client import groq_client, GroqClient, LLMUnavailableError
\ No newline at end of file
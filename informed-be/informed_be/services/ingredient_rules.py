@@ -0,0 +1,278 @@
+import re
+from typing import Dict, List, Optional, Tuple
+
+from informed_be.config.logging import get_logger
+from informed_be.models.schemas import Assessment
+
+logger = get_logger(__name__)
+
+# Bump whenever KNOWN_INGREDIENTS or E_NUMBERS change, so cached results and ETags built from rule assessments are invalidated.
+RULES_VERSION = 2
+
+HEALTHY = "healthy"
+UNHEALTHY = "unhealthy"
+NEUTRAL = "neutral"
+
+# Curated knowledge base of common packaged-food ingredients. Keys are
+# lowercase phrases; ratings follow the same healthy/unhealthy/neutral scale
+# the LLM is prompted with.
+KNOWN_INGREDIENTS: Dict[str, Tuple[str, str]] = {
+    # Sugars and sweeteners
+    "sugar": (UNHEALTHY, "Added sugar; empty calories linked to obesity and tooth decay"),
+    "cane sugar": (UNHEALTHY, "Added sugar; empty calories linked to obesity and tooth decay"),
+    "brown sugar": (UNHEALTHY, "Added sugar with negligible minerals; empty calories"),
+    "icing sugar": (UNHEALTHY, "Added sugar; empty calories linked to obesity and tooth decay"),
+    "sucrose": (UNHEALTHY, "Added sugar; empty calories linked to obesity and tooth decay"),
+    "glucose": (UNHEALTHY, "Added sugar that raises blood glucose quickly"),
+    "glucose syrup": (UNHEALTHY, "Refined sugar syrup that raises blood glucose quickly"),
+    "glucose-fructose syrup": (UNHEALTHY, "Refined sugar syrup linked to metabolic issues"),
+    "fructose": (UNHEALTHY, "Added sugar; excess intake linked to fatty liver"),
+    "dextrose": (UNHEALTHY, "Added sugar that raises blood glucose quickly"),
+    "maltodextrin": (UNHEALTHY, "Highly processed carbohydrate with a high glycemic index"),
+    "corn syrup": (UNHEALTHY, "Refined sugar syrup linked to obesity"),
+    "high fructose corn syrup": (UNHEALTHY, "Refined sugar syrup linked to obesity and metabolic disease"),
+    "invert sugar": (UNHEALTHY, "Added sugar; empty calories"),
+    "invert sugar syrup": (UNHEALTHY, "Added sugar; empty calories"),
+    "honey": (NEUTRAL, "Natural sweetener but still mostly sugar; fine in moderation"),
+    "maple syrup": (NEUTRAL, "Natural sweetener but still mostly sugar; fine in moderation"),
+    "molasses": (NEUTRAL, "Sugar by-product with some minerals; fine in moderation"),
+    "aspartame": (NEUTRAL, "Approved low-calorie sweetener; long-term effects debated"),
+    "sucralose": (NEUTRAL, "Approved low-calorie sweetener; long-term effects debated"),
+    "acesulfame k": (NEUTRAL, "Approved low-calorie sweetener; long-term effects debated"),
+    "stevia": (NEUTRAL, "Plant-derived zero-calorie sweetener"),
+    "erythritol": (NEUTRAL, "Low-calorie sugar alcohol; may cause digestive upset in excess"),
+    "sorbitol": (NEUTRAL, "Sugar alcohol; may cause digestive upset in excess"),
+    # Fats and oils
+    "palm oil": (UNHEALTHY, "High in saturated fat"),
+    "palm kernel oil": (UNHEALTHY, "Very high in saturated fat"),
+    "coconut oil": (UNHEALTHY, "Very high in saturated fat"),
+    "hydrogenated vegetable oil": (UNHEALTHY, "May contain trans fats linked to heart disease"),
+    "partially hydrogenated oil": (UNHEALTHY, "Source of trans fats linked to heart disease"),
+    "vegetable oil": (NEUTRAL, "Source of fat; nutritional value depends on the oil blend"),
+    "sunflower oil": (NEUTRAL, "Source of vitamin E but high in omega-6 fats"),
+    "rapeseed oil": (HEALTHY, "Low in saturated fat with a good omega-3 balance"),
+    "canola oil": (HEALTHY, "Low in saturated fat with a good omega-3 balance"),
+    "olive oil": (HEALTHY, "Rich in monounsaturated fats and antioxidants"),
+    "extra virgin olive oil": (HEALTHY, "Rich in monounsaturated fats and polyphenols"),
+    "soybean oil": (NEUTRAL, "Source of polyunsaturated fat, high in omega-6"),
+    "corn oil": (NEUTRAL, "Source of polyunsaturated fat, high in omega-6"),
+    "butter": (NEUTRAL, "Natural fat but high in saturated fat; fine in moderation"),
+    "cocoa butter": (NEUTRAL, "Natural fat but high in saturated fat"),
+    "margarine": (UNHEALTHY, "Processed fat that may contain trans fats"),
+    "shortening": (UNHEALTHY, "Processed fat that may contain trans fats"),
+    # Emulsifiers, thickeners and stabilisers
+    "lecithin": (NEUTRAL, "Common emulsifier, generally recognised as safe"),
+    "soy lecithin": (NEUTRAL, "Common emulsifier, generally recognised as safe"),
+    "sunflower lecithin": (NEUTRAL, "Common emulsifier, generally recognised as safe"),
+    "mono- and diglycerides of fatty acids": (NEUTRAL, "Emulsifier; may contain small amounts of trans fat"),
+    "polysorbate 80": (NEUTRAL, "Synthetic emulsifier; may affect gut microbiota in high doses"),
+    "carrageenan": (NEUTRAL, "Seaweed-derived thickener; may irritate the gut in sensitive people"),
+    "xanthan gum": (NEUTRAL, "Fermentation-derived thickener, generally recognised as safe"),
+    "guar gum": (NEUTRAL, "Plant-derived thickener that adds soluble fibre"),
+    "gum arabic": (NEUTRAL, "Plant-derived stabiliser that adds soluble fibre"),
+    "pectin": (NEUTRAL, "Fruit-derived gelling agent and soluble fibre"),
+    "gelatin": (NEUTRAL, "Animal-derived gelling agent"),
+    "modified starch": (NEUTRAL, "Processed starch used as a thickener"),
+    "modified corn starch": (NEUTRAL, "Processed starch used as a thickener"),
+    "corn starch": (NEUTRAL, "Refined starch; calories with little nutritional value"),
+    "cellulose": (NEUTRAL, "Plant fibre used as a bulking agent"),
+    # Preservatives, acids and antioxidants
+    "sodium benzoate": (UNHEALTHY, "Preservative that can form benzene with vitamin C"),
+    "potassium sorbate": (NEUTRAL, "Common preservative, generally recognised as safe"),
+    "sorbic acid": (NEUTRAL, "Common preservative, generally recognised as safe"),
+    "sodium nitrite": (UNHEALTHY, "Curing agent linked to carcinogenic nitrosamines"),
+    "sodium nitrate": (UNHEALTHY, "Curing agent linked to carcinogenic nitrosamines"),
+    "sulphur dioxide": (NEUTRAL, "Preservative; may trigger reactions in asthmatics"),
+    "bha": (UNHEALTHY, "Synthetic antioxidant and possible carcinogen"),
+    "bht": (UNHEALTHY, "Synthetic antioxidant with debated safety"),
+    "citric acid": (NEUTRAL, "Acidity regulator, generally recognised as safe"),
+    "ascorbic acid": (HEALTHY, "Vitamin C; antioxidant"),
+    "tocopherols": (HEALTHY, "Vitamin E; antioxidant"),
+    "lactic acid": (NEUTRAL, "Acidity regulator, generally recognised as safe"),
+    "acetic acid": (NEUTRAL, "Acidity regulator, generally recognised as safe"),
+    "phosphoric acid": (UNHEALTHY, "Acidulant linked to reduced bone density and tooth erosion"),
+    "sodium bicarbonate": (NEUTRAL, "Raising agent, generally recognised as safe"),
+    # Flavour enhancers, colours and misc
+    "monosodium glutamate": (NEUTRAL, "Flavour enhancer, generally recognised as safe in normal amounts"),
+    "msg": (NEUTRAL, "Flavour enhancer, generally recognised as safe in normal amounts"),
+    "natural flavouring": (NEUTRAL, "Flavouring of natural origin; composition undisclosed"),
+    "natural flavor": (NEUTRAL, "Flavouring of natural origin; composition undisclosed"),
+    "artificial flavor": (NEUTRAL, "Synthetic flavouring; indicates a processed product"),
+    "caramel color": (NEUTRAL, "Colouring; some types contain 4-MEI, a possible carcinogen"),
+    "tartrazine": (UNHEALTHY, "Azo dye linked to hyperactivity in children"),
+    "sunset yellow": (UNHEALTHY, "Azo dye linked to hyperactivity in children"),
+    "allura red": (UNHEALTHY, "Azo dye linked to hyperactivity in children"),
+    "titanium dioxide": (UNHEALTHY, "Whitening agent no longer considered safe in the EU"),
+    "salt": (UNHEALTHY, "High sodium intake raises blood pressure"),
+    "sea salt": (UNHEALTHY, "High sodium intake raises blood pressure"),
+    "caffeine": (NEUTRAL, "Stimulant; safe in moderate amounts"),
+    "taurine": (NEUTRAL, "Amino acid, generally recognised as safe"),
+    # Whole-food staples
+    "water": (HEALTHY, "Essential for hydration with no calories"),
+    "wheat flour": (NEUTRAL, "Refined grain; calories with little fibre"),
+    "whole wheat flour": (HEALTHY, "Whole grain rich in fibre"),
+    "wholegrain oats": (HEALTHY, "Whole grain rich in beta-glucan fibre"),
+    "oats": (HEALTHY, "Whole grain rich in beta-glucan fibre"),
+    "milk": (HEALTHY, "Good source of protein and calcium"),
+    "skimmed milk powder": (HEALTHY, "Source of protein and calcium"),
+    "whey protein": (HEALTHY, "High-quality complete protein"),
+    "eggs": (HEALTHY, "High-quality protein with vitamins and minerals"),
+    "cocoa powder": (HEALTHY, "Rich in fibre and antioxidant flavanols"),
+    "yeast": (NEUTRAL, "Leavening agent with some B vitamins"),
+}
+
+# E-numbers map to the same entries as their common names.
+E_NUMBERS: Dict[str, str] = {
+    "e102": "tartrazine",
+    "e110": "sunset yellow",
+    "e129": "allura red",
+    "e150d": "caramel color",
+    "e171": "titanium dioxide",
+    "e200": "sorbic acid",
+    "e202": "potassium sorbate",
+    "e211": "sodium benzoate",
+    "e220": "sulphur dioxide",
+    "e250": "sodium nitrite",
+    "e251": "sodium nitrate",
+    "e260": "acetic acid",
+    "e270": "lactic acid",
+    "e300": "ascorbic acid",
+    "e306": "tocopherols",
+    "e320": "bha",
+    "e321": "bht",
+    "e322": "lecithin",
+    "e330": "citric acid",
+    "e338": "phosphoric acid",
+    "e407": "carrageenan",
+    "e412": "guar gum",
+    "e414": "gum arabic",
+    "e415": "xanthan gum",
+    "e433": "polysorbate 80",
+    "e440": "pectin",
+    "e460": "cellulose",
+    "e471": "mono- and diglycerides of fatty acids",
+    "e500": "sodium bicarbonate",
+    "e621": "monosodium glutamate",
+    "e950": "acesulfame k",
+    "e951": "aspartame",
+    "e955": "sucralose",
+    "e960": "stevia",
+}
+
+# Leading words that do not change the assessment of the ingredient they qualify.
+QUALIFIERS = frozenset({
+    "organic", "natural", "pure", "refined", "unrefined", "raw", "dried", "fresh",
+    "powdered", "ground", "whole", "cold-pressed", "fortified", "pasteurised", "pasteurized",
+})
+
+# Label class names that only say what a parenthesised additive does, e.g. "Emulsifier (Soy Lecithin)".
+# For any other outer text the parenthetical lists sub-ingredients and says nothing about the whole.
+FUNCTIONAL_CLASSES = frozenset({
+    "emulsifier", "preservative", "colour", "color", "antioxidant", "acidity regulator",
+    "thickener", "sweetener", "flavour enhancer", "flavor enhancer", "stabiliser", "stabilizer",
+    "gelling agent", "raising agent",
+})
+
+_E_NUMBER_RE = re.compile(r"^e\s*-?\s*(\d{3,4}[a-z]?)$")
+_PARENTHETICAL_RE = re.compile(r"\(([^)]*)\)")
+_PERCENT_RE = re.compile(r"\d+(?:[.,]\d+)?\s*%")
+
+
+class _Trie:
+    """Token trie over reversed ingredient phrases, for longest-suffix matching."""
+
+    __slots__ = ("children", "phrase")
+
+    def __init__(self):
+        self.children: Dict[str, "_Trie"] = {}
+        self.phrase: Optional[str] = None
+
+    def insert(self, phrase: str) -> None:
+        node = self
+        for token in reversed(phrase.split()):
+            node = node.children.setdefault(token, _Trie())
+        node.phrase = phrase
+
+    def longest_suffix(self, tokens: List[str]) -> Tuple[Optional[str], int]:
+        """Return the longest known phrase ending the token list and how many tokens it spans."""
+        node, match, length = self, None, 0
+        for i, token in enumerate(reversed(tokens), start=1):
+            node = node.children.get(token)
+            if node is None:
+                break
+            if node.phrase is not None:
+                match, length = node.phrase, i
+        return match, length
+
+
+_index = _Trie()
+for _phrase in KNOWN_INGREDIENTS:
+    _index.insert(_phrase)
+
+
+def _normalize(text: str) -> str:
+    text = _PERCENT_RE.sub(" ", text.lower())
+    return " ".join(text.replace(",", " ").split())
+
+
+def _match_phrase(text: str) -> Optional[str]:
+    normalized = _normalize(text)
+    if not normalized:
+        return None
+
+    e_number = _E_NUMBER_RE.match(normalized)
+    if e_number:
+        return E_NUMBERS.get(f"e{e_number.group(1)}")
+
+    tokens = normalized.split()
+    phrase = _match_tokens(tokens)
+    if phrase is None and len(tokens[-1]) > 3 and tokens[-1].endswith("s"):
+        # Plural label forms such as "Natural Flavors".
+        phrase = _match_tokens(tokens[:-1] + [tokens[-1][:-1]])
+    return phrase
+
+
+def _match_tokens(tokens: List[str]) -> Optional[str]:
+    phrase, length = _index.longest_suffix(tokens)
+    if phrase is None:
+        return None
+    if all(token in QUALIFIERS for token in tokens[:len(tokens) - length]):
+        return phrase
+    return None
+
+
+def _is_functional_class(text: str) -> bool:
+    normalized = _normalize(text).rstrip(":").strip()
+    if normalized.endswith("s") and normalized[:-1] in FUNCTIONAL_CLASSES:
+        return True
+    return normalized in FUNCTIONAL_CLASSES
+
+
+class IngredientRules:
+    @staticmethod
+    def match(name: str) -> Optional[Assessment]:
+        """Deterministically assess a well-known ingredient, or return None if it is unknown.
+
+        Handles label forms such as "Organic Cane Sugar", "E322", "Salt (1.2%)"
+        and "Emulsifier (Soy Lecithin)".
+        """
+        outer = _PARENTHETICAL_RE.sub(" ", name)
+        candidates = [outer]
+        if _is_functional_class(outer):
+            candidates += _PARENTHETICAL_RE.findall(name)
+        for candidate in candidates:
+            phrase = _match_phrase(candidate)
+            if phrase is not None:
+                rating, reason = KNOWN_INGREDIENTS[phrase]
+                return Assessment(rating=rating, reason=reason)
+        return None
+
+    @staticmethod
+    def classify(names: List[str]) -> Dict[str, Assessment]:
+        assessments = {}
+        for name in names:
+            assessment = IngredientRules.match(name)
+            if assessment is not None:
+                assessments[name] = assessment
+        logger.debug(f"Rule classifier matched {len(assessments)}/{len(names)} ingredients")
+        return assessments
@@ -0,0 +1,78 @@
+import hashlib
+import threading
+import time
+from collections import OrderedDict
+from typing import Optional, Tuple
+
+from informed_be.config.settings import settings
+from informed_be.config.logging import get_logger
+from informed_be.db import lookup_llm_response, save_llm_response
+from informed_be.metrics import LLM_CACHE_HITS, LLM_CACHE_MISSES, LLM_CACHE_SAVED_SECONDS
+
+logger = get_logger(__name__)
+
+
+def make_cache_key(model: str, prompt_text: str) -> str:
+    return hashlib.sha256(f"{model}\n{prompt_text}".encode("utf-8")).hexdigest()
+
+
+class LLMResponseCache:
+    """Exact-match LLM response cache: bounded in-process LRU backed by the llm_responses table."""
+
+    def __init__(self, max_entries: int, ttl_seconds: int):
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self._entries: "OrderedDict[str, Tuple[str, float, float]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: str, node: str) -> Optional[str]:
+        local = self._get_local(key)
+        if local is not None:
+            content, latency = local
+            LLM_CACHE_HITS.labels(node=node, layer="memory").inc()
+            LLM_CACHE_SAVED_SECONDS.labels(node=node).inc(latency)
+            logger.debug(f"LLM cache hit (memory) for {node}: {key[:12]}")
+            return content
+
+        stored = lookup_llm_response(key)
+        if stored is not None:
+            content, latency = stored
+            self._put_local(key, content, latency)
+            LLM_CACHE_HITS.labels(node=node, layer="db").inc()
+            LLM_CACHE_SAVED_SECONDS.labels(node=node).inc(latency)
+            logger.debug(f"LLM cache hit (db) for {node}: {key[:12]}")
+            return content
+
+        LLM_CACHE_MISSES.labels(node=node).inc()
+        return None
+
+    def put(self, key: str, content: str, latency_seconds: float) -> None:
+        self._put_local(key, content, latency_seconds)
+        save_llm_response(key, settings.MODEL, content, latency_seconds, self.ttl_seconds)
+
+    def _get_local(self, key: str) -> Optional[Tuple[str, float]]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            content, latency, expires_at = entry
+            if expires_at <= time.monotonic():
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+            return content, latency
+
+    def _put_local(self, key: str, content: str, latency_seconds: float) -> None:
+        if self.max_entries <= 0:
+            return
+        with self._lock:
+            self._entries[key] = (content, latency_seconds, time.monotonic() + self.ttl_seconds)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+
+llm_response_cache = LLMResponseCache(
+    max_entries=settings.LLM_CACHE_MAX_ENTRIES,
+    ttl_seconds=settings.LLM_CACHE_TTL_SECONDS,
+)
@@ -0,0 +1,249 @@
+import random
+import threading
+import time
+from typing import Callable, Dict, Optional
+
+from groq import APIConnectionError, APIStatusError, RateLimitError
+from langchain_core.language_models import BaseChatModel
+from langchain_core.prompt_values import PromptValue
+from langchain_core.prompts import ChatPromptTemplate
+
+from informed_be.config.settings import settings
+from informed_be.config.logging import get_logger
+from informed_be.metrics import (
+    GROQ_API_CALLS, GROQ_API_ERRORS, GROQ_API_DURATION, GROQ_API_RETRIES,
+    GROQ_THROTTLE_WAIT, GROQ_CIRCUIT_STATE, GROQ_CIRCUIT_REJECTIONS,
+)
+from informed_be.services.llm_cache import llm_response_cache, make_cache_key
+
+logger = get_logger(__name__)
+
+
+class LLMUnavailableError(Exception):
+    """Raised when Groq cannot be called: circuit open, deadline exceeded or retries exhausted."""
+
+
+class TokenBucket:
+    """Local request rate limiter that can also be paused by server rate-limit headers."""
+
+    def __init__(self, rate_per_minute: int):
+        self.capacity = max(1, rate_per_minute)
+        self.refill_per_second = self.capacity / 60.0
+        self._tokens = float(self.capacity)
+        self._updated = time.monotonic()
+        self._paused_until = 0.0
+        self._lock = threading.Lock()
+
+    def pause_for(self, seconds: float) -> None:
+        """Hold all requests until the server's reset time, then allow one straight away."""
+        with self._lock:
+            self._paused_until = max(self._paused_until, time.monotonic() + seconds)
+            # Refill restarts at the end of the pause, with exactly one token ready then.
+            self._tokens = 1.0
+            self._updated = self._paused_until
+
+    def acquire(self, deadline: float) -> float:
+        """Block until a token is available; returns seconds waited. Raises if the wait would pass the deadline."""
+        start = time.monotonic()
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                if now > self._updated:
+                    self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.refill_per_second)
+                    self._updated = now
+                if now >= self._paused_until and self._tokens >= 1.0:
+                    self._tokens -= 1.0
+                    return now - start
+                wait = max(self._paused_until - now, (1.0 - self._tokens) / self.refill_per_second)
+            if now + wait > deadline:
+                raise LLMUnavailableError(f"Rate limit wait of {wait:.1f}s exceeds deadline")
+            time.sleep(wait)
+
+
+class CircuitBreaker:
+    CLOSED, HALF_OPEN, OPEN = 0, 1, 2
+
+    def __init__(self, failure_threshold: int, reset_seconds: float):
+        self.failure_threshold = failure_threshold
+        self.reset_seconds = reset_seconds
+        self._state = self.CLOSED
+        self._failures = 0
+        self._opened_at = 0.0
+        self._probe_in_flight = False
+        self._lock = threading.Lock()
+        GROQ_CIRCUIT_STATE.set(self.CLOSED)
+
+    def allow(self) -> bool:
+        with self._lock:
+            if self._state == self.CLOSED:
+                return True
+            if self._state == self.OPEN and time.monotonic() - self._opened_at >= self.reset_seconds:
+                self._set_state(self.HALF_OPEN)
+            if self._state == self.HALF_OPEN and not self._probe_in_flight:
+                self._probe_in_flight = True
+                return True
+            return False
+
+    def release(self) -> None:
+        """Give back a half-open probe slot without judging Groq's health."""
+        with self._lock:
+            self._probe_in_flight = False
+
+    def record_success(self) -> None:
+        with self._lock:
+            self._failures = 0
+            self._probe_in_flight = False
+            if self._state != self.CLOSED:
+                logger.info("Groq circuit breaker closed")
+                self._set_state(self.CLOSED)
+
+    def record_failure(self) -> None:
+        with self._lock:
+            self._failures += 1
+            self._probe_in_flight = False
+            if self._state == self.HALF_OPEN or self._failures >= self.failure_threshold:
+                if self._state != self.OPEN:
+                    logger.warning(f"Groq circuit breaker opened after {self._failures} consecutive failures")
+                self._opened_at = time.monotonic()
+                self._set_state(self.OPEN)
+
+    def _set_state(self, state: int) -> None:
+        self._state = state
+        GROQ_CIRCUIT_STATE.set(state)
+
+
+def _is_retryable(error: Exception) -> bool:
+    if isinstance(error, (RateLimitError, APIConnectionError)):
+        return True
+    return isinstance(error, APIStatusError) and error.status_code >= 500
+
+
+def _parse_duration(value: str) -> Optional[float]:
+    """Parse Groq rate-limit durations such as "250ms", "7.66s", "2m59.56s" or a plain retry-after "12"."""
+    try:
+        return float(value)
+    except ValueError:
+        pass
+    total, number, i = 0.0, "", 0
+    while i < len(value):
+        char = value[i]
+        if char.isdigit() or char == ".":
+            number += char
+        elif number and value.startswith("ms", i):
+            total += float(number) / 1000
+            number = ""
+            i += 1
+        elif number and char in "hms":
+            total += float(number) * {"h": 3600, "m": 60, "s": 1}[char]
+            number = ""
+        else:
+            return None
+        i += 1
+    return total if not number else None
+
+
+def _retry_after(error: Exception) -> Optional[float]:
+    response = getattr(error, "response", None)
+    if response is None:
+        return None
+    for header in ("retry-after", "x-ratelimit-reset-requests", "x-ratelimit-reset-tokens"):
+        value = response.headers.get(header)
+        if value:
+            seconds = _parse_duration(value)
+            if seconds is not None:
+                return seconds
+    return None
+
+
+class GroqClient:
+    """Cache-aware Groq caller with deadlines, jittered retries, rate limiting and a circuit breaker."""
+
+    def __init__(self):
+        self.bucket = TokenBucket(settings.GROQ_REQUESTS_PER_MINUTE)
+        self.breaker = CircuitBreaker(settings.GROQ_BREAKER_FAILURE_THRESHOLD, settings.GROQ_BREAKER_RESET_SECONDS)
+
+    def invoke(self, node: str, prompt: ChatPromptTemplate, llm: BaseChatModel, inputs: Dict[str, str],
+               cacheable: Callable[[str], bool] = lambda content: True, use_cache: bool = True) -> str:
+        """Render the prompt and call the LLM, answering from the LLM response cache when the exact prompt was seen before.
+
+        With use_cache=False the cache is not consulted but still updated with the fresh response.
+        """
+        prompt_value = prompt.invoke(inputs)
+        cache_key = make_cache_key(settings.MODEL, prompt_value.to_string())
+        if use_cache:
+            cached = llm_response_cache.get(cache_key, node)
+            if cached is not None:
+                return cached
+
+        content, latency = self._call_with_retries(node, llm, prompt_value)
+        if cacheable(content):
+            llm_response_cache.put(cache_key, content, latency)
+        return content
+
+    def _call_with_retries(self, node: str, llm: BaseChatModel, prompt_value: PromptValue):
+        """Call Groq with retries, recording a single circuit breaker outcome for the whole call."""
+        deadline = time.monotonic() + settings.GROQ_DEADLINE_SECONDS
+        if not self.breaker.allow():
+            GROQ_CIRCUIT_REJECTIONS.inc()
+            raise LLMUnavailableError("Groq circuit breaker is open")
+
+        attempt = 0
+        while True:
+            try:
+                waited = self.bucket.acquire(deadline)
+            except LLMUnavailableError:
+                self.breaker.release()
+                raise
+            GROQ_THROTTLE_WAIT.observe(waited)
+
+            # Cap each attempt at the remaining budget so retries never overrun the deadline.
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                self.breaker.release()
+                raise LLMUnavailableError(f"Groq deadline exceeded after {attempt} attempts")
+            timeout = min(settings.GROQ_TIMEOUT_SECONDS, remaining)
+
+            GROQ_API_CALLS.inc()
+            start = time.perf_counter()
+            try:
+                with GROQ_API_DURATION.time():
+                    response = llm.invoke(prompt_value, timeout=timeout)
+            except Exception as e:
+                error_type = type(e).__name__
+                GROQ_API_ERRORS.labels(error_type=error_type).inc()
+                logger.error(f"Groq API call failed ({node}, attempt {attempt + 1}): {error_type} - {str(e)}")
+                if not _is_retryable(e):
+                    # The request itself was bad; Groq answered, so it says nothing about availability.
+                    self.breaker.release()
+                    raise
+
+                retry_after = _retry_after(e) if isinstance(e, RateLimitError) else None
+                if retry_after is not None:
+                    self.bucket.pause_for(retry_after)
+                    delay = retry_after
+                else:
+                    backoff = min(settings.GROQ_BACKOFF_MAX_SECONDS, settings.GROQ_BACKOFF_BASE_SECONDS * 2 ** attempt)
+                    delay = random.uniform(0, backoff)
+
+                attempt += 1
+                if attempt > settings.GROQ_MAX_RETRIES or time.monotonic() + delay > deadline:
+                    self._record_give_up(e)
+                    raise LLMUnavailableError(f"Groq call gave up after {attempt} attempts: {error_type}") from e
+
+                GROQ_API_RETRIES.labels(error_type=error_type).inc()
+                if retry_after is None:
+                    time.sleep(delay)
+                continue
+
+            self.breaker.record_success()
+            return response.content, time.perf_counter() - start
+
+    def _record_give_up(self, error: Exception) -> None:
+        # Throttling is handled by pausing the bucket; it is not Groq being unavailable.
+        if isinstance(error, RateLimitError):
+            self.breaker.release()
+        else:
+            self.breaker.record_failure()
+
+
+groq_client = GroqClient()
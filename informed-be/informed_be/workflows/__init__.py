@@ -1 +1,2 @@
-from .ingredient_graph import analyze_ingredients
+from .ingredient_graph import analyze_ingredients, lookup_analysis_by_hash
+from .cache_maintenance import cache_maintenance, CacheMaintenance
\ No newline at end of file
@@ -0,0 +1,98 @@
+import threading
+from typing import Optional
+
+from informed_be.config.logging import get_logger
+from informed_be.config.settings import settings
+from informed_be.db import (
+    flush_ingredient_hits, find_stale_ingredients, update_refreshed_ingredients,
+    evict_ingredients, purge_expired_llm_responses,
+)
+from informed_be.metrics import INGREDIENT_REFRESHES, CACHE_EVICTIONS, CACHE_MAINTENANCE_DURATION
+from informed_be.services.llm_client import LLMUnavailableError
+from informed_be.workflows.ingredient_graph import ASSESS_PROMPT_VERSION, reassess_ingredients
+
+logger = get_logger(__name__)
+
+
+class CacheMaintenance:
+    """Background thread that keeps the ingredient cache fresh and bounded, off the request path.
+
+    Each cycle flushes buffered hit counts, re-assesses a throttled number of
+    stale rows (other model/prompt version, or 'unknown' ratings), evicts rarely
+    used rows and purges expired LLM responses.
+    """
+
+    def __init__(self, interval_seconds: float):
+        self.interval_seconds = interval_seconds
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def start(self) -> None:
+        if self._thread is not None:
+            return
+        self._thread = threading.Thread(target=self._run, name="cache-maintenance", daemon=True)
+        self._thread.start()
+        logger.info(f"Cache maintenance started (every {self.interval_seconds}s)")
+
+    def stop(self) -> None:
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout=5)
+            self._thread = None
+        # Don't lose hits counted since the last cycle.
+        flush_ingredient_hits()
+
+    def _run(self) -> None:
+        while not self._stop.wait(self.interval_seconds):
+            try:
+                self.run_once()
+            except Exception as e:
+                logger.error(f"Cache maintenance cycle failed: {type(e).__name__} - {str(e)}")
+
+    def run_once(self) -> None:
+        with CACHE_MAINTENANCE_DURATION.labels(task="flush_hits").time():
+            flushed = flush_ingredient_hits()
+        logger.debug(f"Flushed hit counts for {flushed} ingredients")
+
+        with CACHE_MAINTENANCE_DURATION.labels(task="refresh").time():
+            self._refresh_stale()
+
+        if settings.CACHE_EVICT_IDLE_DAYS > 0:
+            with CACHE_MAINTENANCE_DURATION.labels(task="evict").time():
+                evicted = evict_ingredients(settings.CACHE_EVICT_IDLE_DAYS, settings.CACHE_EVICT_MIN_HITS)
+            CACHE_EVICTIONS.labels(table="ingredients").inc(evicted)
+            if evicted:
+                logger.info(f"Evicted {evicted} rarely used ingredients")
+
+        with CACHE_MAINTENANCE_DURATION.labels(task="purge_llm_responses").time():
+            purged = purge_expired_llm_responses()
+        CACHE_EVICTIONS.labels(table="llm_responses").inc(purged)
+
+    def _refresh_stale(self) -> None:
+        for _ in range(settings.CACHE_REFRESH_MAX_BATCHES):
+            if self._stop.is_set():
+                return
+            names = find_stale_ingredients(
+                ASSESS_PROMPT_VERSION, settings.CACHE_UNKNOWN_RETRY_SECONDS, settings.CACHE_REFRESH_BATCH_SIZE
+            )
+            if not names:
+                return
+
+            logger.info(f"Refreshing {len(names)} stale ingredient assessments")
+            try:
+                assessments = reassess_ingredients(names)
+            except LLMUnavailableError as e:
+                # Leave the rest for the next cycle rather than adding load to a degraded Groq.
+                INGREDIENT_REFRESHES.labels(outcome="skipped").inc(len(names))
+                logger.warning(f"Skipping ingredient refresh, Groq unavailable: {str(e)}")
+                return
+
+            changed = update_refreshed_ingredients(names, assessments, ASSESS_PROMPT_VERSION)
+            usable = {name.lower().strip() for name, assessment in assessments.items() if assessment.rating != "unknown"}
+            failed = sum(1 for name in names if name not in usable)
+            INGREDIENT_REFRESHES.labels(outcome="changed").inc(changed)
+            INGREDIENT_REFRESHES.labels(outcome="unchanged").inc(len(names) - changed - failed)
+            INGREDIENT_REFRESHES.labels(outcome="failed").inc(failed)
+
+
+cache_maintenance = CacheMaintenance(settings.CACHE_MAINTENANCE_INTERVAL_SECONDS)
@@ -1,5 +1,8 @@
+import hashlib
 import json
-from typing import Dict, List, TypedDict
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor, TimeoutError as FutureTimeoutError
+from typing import Dict, List, Optional, Set, Tuple, TypedDict
 
 from langchain_core.prompts import ChatPromptTemplate
 from langchain_groq import ChatGroq
@@ -7,12 +10,15 @@ from langgraph.graph import StateGraph, END
 
 from informed_be.config.logging import get_logger
 from informed_be.config.settings import settings
-from informed_be.db import save_to_db, lookup_assessments_by_names
+from informed_be.db import save_to_db, lookup_assessments_by_names, lookup_analysis, save_analysis, delete_analysis
 from informed_be.metrics import (
     CACHE_HITS, CACHE_MISSES,
-    GROQ_API_CALLS, GROQ_API_ERRORS, GROQ_API_DURATION,
+    GROQ_API_ERRORS, DEGRADED_RESPONSES, BACKGROUND_ASSESSMENTS,
+    RULE_CLASSIFIER_MATCHES, RULE_CLASSIFIER_LLM_CALLS_AVOIDED,
 )
 from informed_be.models.schemas import Ingredient, Assessment
+from informed_be.services.ingredient_rules import IngredientRules, RULES_VERSION
+from informed_be.services.llm_client import groq_client, LLMUnavailableError
 from informed_be.services.ocr_service import OCRService
 
 logger = get_logger(__name__)
@@ -23,8 +29,129 @@ class GraphState(TypedDict):
     extracted_text: str
     ingredients: List[Ingredient]
     assessments: Dict[str, Assessment]
+    status: str
+    pending: List[str]
+    degraded: bool
+
+# Retries are owned by GroqClient, which also passes a per-attempt timeout capped at the remaining deadline.
+llm = ChatGroq(model=settings.MODEL, timeout=settings.GROQ_TIMEOUT_SECONDS, max_retries=0)
+
+identify_prompt = ChatPromptTemplate.from_messages([
+    ("system", "You are a precise ingredient extraction tool. You ONLY output comma-separated ingredient lists with no additional text whatsoever."),
+    ("human", "Extract ingredients from: {text}\n\nOutput format: ingredient1, ingredient2, ingredient3")
+])
+
+# Bump whenever assess_prompt changes so the cache maintenance task re-assesses rows made with the old prompt.
+ASSESS_PROMPT_VERSION = 1
+
+assess_prompt = ChatPromptTemplate.from_messages([
+    ("system", "You are a certified nutrition expert. Assess food ingredients based on general nutritional science: 'healthy' for nutrient-dense/low-calorie items (e.g., vegetables), 'unhealthy' for high-sugar/processed items, 'neutral' for moderate ones. Provide brief, evidence-based reasons. Output raw JSON only."),
+    ("human", "For these ingredients: {ingredients}, rate each as 'healthy', 'unhealthy', or 'neutral' with a brief reason. If unknown or empty, return empty dict. Format as: {{\"ingredient1\": {{\"rating\": \"healthy\", \"reason\": \"Rich in vitamins\"}}, \"ingredient2\": {{...}}}}"),
+    ("human", "Example: Ingredients: sugar, kale\nOutput: {{\"sugar\": {{\"rating\": \"unhealthy\", \"reason\": \"High in empty calories, linked to obesity\"}}, \"kale\": {{\"rating\": \"healthy\", \"reason\": \"Packed with vitamins and fiber\"}}}}"),
+    ("human", "Now assess: {ingredients}")])
+
+
+def _is_assessment_json(content: str) -> bool:
+    """Only cache responses shaped like {"name": {"rating": ..., "reason": ...}}, so a malformed reply is retried."""
+    try:
+        assessments_dict = json.loads(content)
+    except (json.JSONDecodeError, TypeError):
+        return False
+    return isinstance(assessments_dict, dict) and all(
+        isinstance(value, dict) and isinstance(value.get("rating"), str) and isinstance(value.get("reason"), str)
+        for value in assessments_dict.values()
+    )
+
+
+def _parse_assessments(content: str) -> Dict[str, Assessment]:
+    logger.debug(f"LLM response for assessment: {content}")
+
+    try:
+        assessments_dict = json.loads(content)
+        logger.debug(f"Parsed assessments: {assessments_dict}")
+    except (json.JSONDecodeError, TypeError):
+        GROQ_API_ERRORS.labels(error_type="invalid_json").inc()
+        logger.error("JSON decode error in assessment response")
+        return {}
+
+    if not isinstance(assessments_dict, dict):
+        GROQ_API_ERRORS.labels(error_type="invalid_json").inc()
+        logger.error(f"Assessment response is a {type(assessments_dict).__name__}, expected an object")
+        return {}
+
+    assessments = {}
+    for key, value in assessments_dict.items():
+        try:
+            assessments[key] = Assessment(rating=value["rating"], reason=value["reason"])
+        except (KeyError, ValueError, TypeError) as e:
+            assessments[key] = Assessment(
+                rating="unknown",
+                reason=f"Parsing failed: {str(e)}"
+            )
+            logger.warning(f"Parsing failed for {key}: {str(e)}")
+    return assessments
+
+
+# LLM assessments run here so a request can stop waiting at its latency budget
+# while the call finishes and persists in the background. Identical in-flight
+# batches are shared between requests.
+_assess_executor = ThreadPoolExecutor(max_workers=settings.ASSESS_BACKGROUND_WORKERS, thread_name_prefix="llm-assess")
+_inflight: Dict[str, Future] = {}
+# Futures some request stopped waiting for; their outcome is counted once, on completion.
+_backgrounded: Set[Future] = set()
+_inflight_lock = threading.Lock()
+
+
+def _assess_with_llm(ingredient_names_str: str, cached_names: List[str]) -> Dict[str, Assessment]:
+    content = groq_client.invoke("assess", assess_prompt, llm, {"ingredients": ingredient_names_str}, cacheable=_is_assessment_json)
+    llm_assessments = _parse_assessments(content)
+    save_to_db({k: v for k, v in llm_assessments.items() if k not in cached_names}, prompt_version=ASSESS_PROMPT_VERSION)
+    return llm_assessments
+
+
+def reassess_ingredients(names: List[str]) -> Dict[str, Assessment]:
+    """Assess names with the current model and prompt, bypassing the LLM response cache."""
+    content = groq_client.invoke("refresh", assess_prompt, llm, {"ingredients": ", ".join(names)},
+                                 cacheable=_is_assessment_json, use_cache=False)
+    return _parse_assessments(content)
+
+
+def _on_assess_done(ingredient_names_str: str, future: Future) -> None:
+    with _inflight_lock:
+        _inflight.pop(ingredient_names_str, None)
+        backgrounded = future in _backgrounded
+        _backgrounded.discard(future)
+    error = future.exception()
+    if error is not None:
+        logger.error(f"Background assessment failed: {type(error).__name__} - {str(error)}")
+    if backgrounded:
+        _record_background_outcome(future)
+
+
+def _submit_assessment(ingredient_names_str: str, cached_names: List[str]) -> Future:
+    with _inflight_lock:
+        future = _inflight.get(ingredient_names_str)
+        if future is not None:
+            logger.debug(f"Joining in-flight assessment for: {ingredient_names_str}")
+            return future
+        future = _assess_executor.submit(_assess_with_llm, ingredient_names_str, cached_names)
+        _inflight[ingredient_names_str] = future
+    future.add_done_callback(lambda f: _on_assess_done(ingredient_names_str, f))
+    return future
+
+
+def _mark_backgrounded(ingredient_names_str: str, future: Future) -> None:
+    """Record that a request gave up waiting on this assessment, however many requests share it."""
+    with _inflight_lock:
+        # Otherwise it finished right at the budget and never really ran in the background.
+        if _inflight.get(ingredient_names_str) is future:
+            _backgrounded.add(future)
+
+
+def _record_background_outcome(future: Future) -> None:
+    outcome = "failed" if future.exception() is not None else "completed"
+    BACKGROUND_ASSESSMENTS.labels(outcome=outcome).inc()
 
-llm = ChatGroq(model=settings.MODEL)
 
 def ocr_node(state: GraphState) -> GraphState:
     logger.debug("Starting OCR node")
@@ -43,16 +170,14 @@ def ocr_node(state: GraphState) -> GraphState:
 def identify_node(state: GraphState) -> GraphState:
     logger.debug("Starting identify node")
 
-    system_prompt = """You are a precise ingredient extraction tool. You ONLY output comma-separated ingredient lists with no additional text whatsoever."""
-
-    prompt = ChatPromptTemplate.from_messages([
-        ("system", system_prompt),
-        ("human", "Extract ingredients from: {text}\n\nOutput format: ingredient1, ingredient2, ingredient3")
-    ])
-    chain = prompt | llm
-
-    response = chain.invoke({"text": state["extracted_text"]})
-    cleaned_names = [name.strip() for name in response.content.split(",")]
+    try:
+        content = groq_client.invoke("identify", identify_prompt, llm, {"text": state["extracted_text"]})
+    except LLMUnavailableError as e:
+        logger.warning(f"Groq unavailable, falling back to raw OCR ingredients: {str(e)}")
+        DEGRADED_RESPONSES.labels(reason="identify_unavailable").inc()
+        content = state["extracted_text"]
+        state["degraded"] = True
+    cleaned_names = [name.strip() for name in content.split(",") if name.strip()]
     state["ingredients"] = [Ingredient(name=name.title()) for name in cleaned_names]
 
     logger.info(f"Identify complete - found {len(cleaned_names)} ingredients")
@@ -64,7 +189,9 @@ def assess_node(state: GraphState) -> GraphState:
     logger.debug(f"Input ingredients: {', '.join([ing.name for ing in state['ingredients']])}")
 
     ingredient_names = [ing.name for ing in state["ingredients"]]
-    cached_rows = lookup_assessments_by_names(ingredient_names)
+    # 'unknown' rows (from before they stopped being stored) are not assessments; re-assess them.
+    cached_rows = {name: row for name, row in lookup_assessments_by_names(ingredient_names, track_hits=True).items()
+                   if row.rating != "unknown"}
     logger.info(f"Cache hit: {len(cached_rows)}/{len(ingredient_names)} ingredients found in DB")
 
     CACHE_HITS.inc(len(cached_rows))
@@ -75,54 +202,54 @@ def assess_node(state: GraphState) -> GraphState:
         assessments[name] = Assessment(rating=row.rating, reason=row.reason)
 
     missing_ingredients = [name for name in ingredient_names if name not in cached_rows]
+
+    rule_assessments = IngredientRules.classify(missing_ingredients)
+    if rule_assessments:
+        RULE_CLASSIFIER_MATCHES.inc(len(rule_assessments))
+        assessments.update(rule_assessments)
+        missing_ingredients = [name for name in missing_ingredients if name not in rule_assessments]
+        logger.info(f"Rule classifier assessed {len(rule_assessments)} ingredients locally")
+        if not missing_ingredients:
+            RULE_CLASSIFIER_LLM_CALLS_AVOIDED.inc()
+
     if missing_ingredients:
         logger.info(f"Cache miss: calling Groq API for {len(missing_ingredients)} ingredients: {missing_ingredients}")
     else:
         logger.info("Full cache hit: no Groq API call needed")
 
+    status, pending = "complete", []
     if missing_ingredients:
-        prompt = ChatPromptTemplate.from_messages([
-            ("system", "You are a certified nutrition expert. Assess food ingredients based on general nutritional science: 'healthy' for nutrient-dense/low-calorie items (e.g., vegetables), 'unhealthy' for high-sugar/processed items, 'neutral' for moderate ones. Provide brief, evidence-based reasons. Output raw JSON only."),
-            ("human", "For these ingredients: {ingredients}, rate each as 'healthy', 'unhealthy', or 'neutral' with a brief reason. If unknown or empty, return empty dict. Format as: {{\"ingredient1\": {{\"rating\": \"healthy\", \"reason\": \"Rich in vitamins\"}}, \"ingredient2\": {{...}}}}"),
-            ("human", "Example: Ingredients: sugar, kale\nOutput: {{\"sugar\": {{\"rating\": \"unhealthy\", \"reason\": \"High in empty calories, linked to obesity\"}}, \"kale\": {{\"rating\": \"healthy\", \"reason\": \"Packed with vitamins and fiber\"}}}}"),
-            ("human", "Now assess: {ingredients}")])
-
-        chain = prompt | llm
         ingredient_names_str = ", ".join(missing_ingredients)
-
-        GROQ_API_CALLS.inc()
+        future = _submit_assessment(ingredient_names_str, list(cached_rows))
         try:
-            with GROQ_API_DURATION.time():
-                response = chain.invoke({"ingredients": ingredient_names_str})
-        except Exception as e:
-            error_type = type(e).__name__
-            GROQ_API_ERRORS.labels(error_type=error_type).inc()
-            logger.error(f"Groq API call failed: {error_type} - {str(e)}")
-            raise
-
-        logger.debug(f"LLM response for assessment: {response.content}")
-
-        try:
-            assessments_dict = json.loads(response.content)
-            logger.debug(f"Parsed assessments: {assessments_dict}")
-        except json.JSONDecodeError:
-            GROQ_API_ERRORS.labels(error_type="invalid_json").inc()
-            state["assessments"] = {}
-            logger.error("JSON decode error in assessment response")
+            llm_assessments = future.result(timeout=settings.ASSESS_LATENCY_BUDGET_SECONDS)
+        except FutureTimeoutError:
+            logger.warning(f"Assessment exceeded {settings.ASSESS_LATENCY_BUDGET_SECONDS}s budget, "
+                           f"returning cached assessments and finishing {len(missing_ingredients)} in background")
+            DEGRADED_RESPONSES.labels(reason="timeout").inc()
+            _mark_backgrounded(ingredient_names_str, future)
+            status, pending = "pending", missing_ingredients
+        except LLMUnavailableError as e:
+            logger.warning(f"Groq unavailable, returning cached assessments only: {str(e)}")
+            DEGRADED_RESPONSES.labels(reason="unavailable").inc()
+            status, pending = "partial", missing_ingredients
         else:
-            for key, value in assessments_dict.items():
-                try:
-                    assessments[key] = Assessment(rating=value["rating"], reason=value["reason"])
-                except (KeyError, ValueError) as e:
-                    assessments[key] = Assessment(
-                        rating="unknown",
-                        reason=f"Parsing failed: {str(e)}"
-                    )
-                    logger.warning(f"Parsing failed for {key}: {str(e)}")
-
-            save_to_db({k: v for k, v in assessments.items() if k not in cached_rows})
+            # An unparseable response, or an ingredient the LLM skipped or malformed, is still unassessed.
+            usable = {name: assessment for name, assessment in llm_assessments.items() if assessment.rating != "unknown"}
+            assessments.update(usable)
+            returned = {name.lower().strip() for name in usable}
+            pending = [name for name in missing_ingredients if name.lower().strip() not in returned]
+            if pending:
+                logger.warning(f"LLM returned no assessment for {len(pending)} ingredients: {pending}")
+                DEGRADED_RESPONSES.labels(reason="incomplete").inc()
+                status = "partial"
+
+    if state.get("degraded") and status == "complete":
+        status = "partial"
 
     state["assessments"] = assessments
+    state["status"] = status
+    state["pending"] = pending
     state["summary"] = "Overall assessment complete."
     logger.debug("Assess node complete")
     logger.debug(f"Final assessments: {state['assessments']}")
@@ -143,11 +270,55 @@ workflow.set_entry_point("ocr")
 graph = workflow.compile()
 
 
-def analyze_ingredients(image_bytes: bytes) -> Dict:
+def analyze_ingredients(image_bytes: bytes, image_hash: Optional[str] = None) -> Dict:
     logger.info("Starting ingredient analysis")
     initial_state = {"image_bytes": image_bytes}
     final_state = graph.invoke(initial_state)
 
-    return {
-        "assessments": final_state.get("assessments", {})
+    result = {
+        "assessments": final_state.get("assessments", {}),
+        "status": final_state.get("status", "complete"),
+        "pending": final_state.get("pending", []),
+    }
+    # Only fully assessed runs are stored; anything else is re-analyzed on the next upload.
+    if image_hash and result["status"] == "complete":
+        save_analysis(image_hash, list(result["assessments"]))
+    return result
+
+
+def lookup_analysis_by_hash(image_hash: str) -> Optional[Tuple[Dict, str]]:
+    """Rebuild a previous analysis from the ingredient cache, returning it with its ETag.
+
+    The ETag covers the image hash plus the row id and version of every assessment
+    it uses, so it changes whenever a cached assessment is refreshed or re-created.
+    If an ingredient has since been evicted, the stored analysis is dropped and
+    None is returned so the image is analyzed again.
+    """
+    names = lookup_analysis(image_hash)
+    if names is None:
+        return None
+
+    cached_rows = {name: row for name, row in lookup_assessments_by_names(names).items() if row.rating != "unknown"}
+    assessments = {name: Assessment(rating=row.rating, reason=row.reason) for name, row in cached_rows.items()}
+    # Row ids are never reused, so an evicted and re-assessed row cannot repeat an old (id, version) pair.
+    versions = [f"{name.lower().strip()}:{row.id}.{row.version}" for name, row in cached_rows.items()]
+
+    remaining = [name for name in names if name not in cached_rows]
+    rule_assessments = IngredientRules.classify(remaining)
+    assessments.update(rule_assessments)
+    versions.extend(f"{name.lower().strip()}:rules-{RULES_VERSION}" for name in rule_assessments)
+
+    evicted = [name for name in remaining if name not in rule_assessments]
+    if evicted:
+        logger.info(f"Stored analysis {image_hash[:12]} no longer has assessments for {len(evicted)} ingredients, dropping it")
+        delete_analysis(image_hash)
+        return None
+
+    digest = hashlib.sha256(f"{image_hash}|{','.join(sorted(versions))}".encode("utf-8")).hexdigest()
+    result = {
+        "assessments": assessments,
+        "status": "complete",
+        "pending": [],
     }
+    return result, f'"{digest[:32]}"'
+
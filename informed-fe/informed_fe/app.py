@@ -4,13 +4,8 @@ import requests
 from informed_fe.components import display_results
 from informed_fe.config import settings
 from informed_fe.config.logging import setup_logging, get_logger
-from informed_fe.metrics import (
-    start_metrics_server,
-    BACKEND_API_REQUESTS, BACKEND_API_ERRORS, BACKEND_API_DURATION,
-    IMAGE_UPLOADS, IMAGE_SIZE_BYTES,
-)
-from informed_fe.models.schemas import AnalysisResult
-from informed_fe.services import StorageService
+from informed_fe.metrics import start_metrics_server
+from informed_fe.services import AnalysisService, ResultCache, Upload
 
 setup_logging()
 logger = get_logger(__name__)
@@ -21,46 +16,46 @@ st.set_page_config(page_title="Ingredient Health Analyzer", layout="wide")
 
 st.title("Ingredient Health Analyzer")
 
-uploaded_file = st.file_uploader("Upload an image of food ingredients", type=["jpg", "jpeg", "png"])
-
-if uploaded_file:
-    IMAGE_UPLOADS.inc()
-
-    try:
-        logger.info(f"Processing uploaded file: {uploaded_file.name}")
-        image_bytes = StorageService.process_image(uploaded_file, compress=True)
-        logger.debug(f"Image processed, size: {len(image_bytes)} bytes")
-
-        IMAGE_SIZE_BYTES.observe(len(image_bytes))
+if "result_cache" not in st.session_state:
+    st.session_state["result_cache"] = ResultCache(settings.SESSION_RESULT_CACHE_MAX_ENTRIES)
+session_result_cache: ResultCache = st.session_state["result_cache"]
 
-        logger.info(f"Sending request to backend: {settings.INFORMED_BE_URL}/analyze")
-        BACKEND_API_REQUESTS.inc()
-
-        try:
-            with BACKEND_API_DURATION.time():
-                response = requests.post(
-                    f"{settings.INFORMED_BE_URL}/analyze",
-                    files={"file": (uploaded_file.name, image_bytes, uploaded_file.type)}
-                )
-                response.raise_for_status()
-        except requests.exceptions.RequestException as e:
-            error_type = type(e).__name__
-            BACKEND_API_ERRORS.labels(error_type=error_type).inc()
-            logger.error(f"API call failed: {str(e)}")
-            st.error(f"API call failed: {str(e)}")
-            raise
-
-        logger.info(f"Backend response received: {response.status_code}")
+uploaded_files = st.file_uploader(
+    "Upload images of food ingredients",
+    type=["jpg", "jpeg", "png"],
+    accept_multiple_files=True,
+)
 
-        result = AnalysisResult(**response.json())
+if uploaded_files:
+    uploads = [
+        Upload(index=i, name=f.name, mime_type=f.type, raw_bytes=f.getvalue())
+        for i, f in enumerate(uploaded_files)
+    ]
 
-        display_results(result)
+    # One placeholder per file keeps upload order while results arrive in completion order.
+    placeholders = []
+    for upload in uploads:
+        placeholder = st.empty()
+        placeholder.info(f"Analyzing {upload.name}...")
+        placeholders.append(placeholder)
 
-    except requests.exceptions.RequestException:
-        pass
-    except ValueError as e:
-        logger.warning(f"Invalid response format: {str(e)}")
-        st.error(f"Invalid response format: {str(e)}")
+    try:
+        for outcome in AnalysisService.analyze_batch(uploads, session_result_cache):
+            with placeholders[outcome.upload.index].container():
+                if len(uploads) > 1:
+                    st.subheader(outcome.upload.name)
+
+                error = outcome.error
+                if error is None:
+                    display_results(outcome.result)
+                elif isinstance(error, requests.exceptions.RequestException):
+                    st.error(f"API call failed: {str(error)}")
+                elif isinstance(error, ValueError):
+                    logger.warning(f"Invalid response format: {str(error)}")
+                    st.error(f"Invalid response format: {str(error)}")
+                else:
+                    logger.error(f"Unexpected error: {str(error)}")
+                    st.error(f"Error: {str(error)}")
     except Exception as e:
         logger.error(f"Unexpected error: {str(e)}")
         st.error(f"Error: {str(e)}")
@@ -9,7 +9,12 @@ def display_results(result: AnalysisResult) -> None:
     logger.debug(f"Analysis result: {result}")
 
     st.write("**Ingredients and Health Assessments**")
-    if result.assessments:
+    if result.status == "pending":
+        st.info(f"{len(result.pending)} ingredient(s) are still being assessed. Upload the label again shortly for the full result.")
+    elif result.status == "partial":
+        st.warning(f"{len(result.pending)} ingredient(s) could not be assessed right now. Please try again later.")
+
+    if result.assessments or result.pending:
         data = [
             {
                 "Ingredient": ingredient_name,
@@ -18,6 +23,10 @@ def display_results(result: AnalysisResult) -> None:
             }
             for ingredient_name, assessment in result.assessments.items()
         ]
+        data.extend(
+            {"Ingredient": ingredient_name, "Rating": result.status, "Reason": "Assessment not available yet"}
+            for ingredient_name in result.pending
+        )
         st.table(data)
     else:
         st.write("No ingredients or assessments found.")
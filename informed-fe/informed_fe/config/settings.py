@@ -8,6 +8,16 @@ class Settings(BaseSettings):
     INFORMED_BE_URL: str
     APP_ENV: str
     MAX_UPLOAD_SIZE_MB: int
+    MAX_INPUT_SIZE_MB: int = 25
+    BACKEND_CONNECT_TIMEOUT_SECONDS: float = 5.0
+    BACKEND_READ_TIMEOUT_SECONDS: float = 120.0
+    BACKEND_POOL_SIZE: int = 10
+    RESULT_CACHE_MAX_ENTRIES: int = 256
+    SESSION_RESULT_CACHE_MAX_ENTRIES: int = 16
+    IMAGE_MAX_LONG_EDGE: int = 2000
+    IMAGE_GRAYSCALE: bool = False
+    IMAGE_PROCESSING_WORKERS: int = 4
+    BACKEND_MAX_CONCURRENCY: int = 4
 
     class Config:
         env_file = f"src/config/{os.getenv('APP_ENV', 'dev')}.env"
@@ -1,5 +1,5 @@
 import threading
-from prometheus_client import Counter, Histogram, start_http_server
+from prometheus_client import Counter, Gauge, Histogram, start_http_server
 
 from informed_fe.config.logging import get_logger
 
@@ -33,6 +33,46 @@ IMAGE_SIZE_BYTES = Histogram(
     buckets=[10_000, 50_000, 100_000, 500_000, 1_000_000, 5_000_000, 10_000_000],
 )
 
+IMAGE_ORIGINAL_SIZE_BYTES = Histogram(
+    "image_original_size_bytes",
+    "Size of images as selected by the user, before resizing and compression",
+    buckets=[10_000, 50_000, 100_000, 500_000, 1_000_000, 5_000_000, 10_000_000],
+)
+
+IMAGE_PROCESSING_DURATION = Histogram(
+    "image_processing_duration_seconds",
+    "Time spent resizing and compressing images before upload",
+    buckets=[0.01, 0.05, 0.1, 0.25, 0.5, 1.0, 2.0, 5.0],
+)
+
+RESULT_CACHE_HITS = Counter(
+    "result_cache_hits_total",
+    "Number of uploads answered from a cached analysis result",
+    labelnames=["layer"],
+)
+
+RESULT_CACHE_MISSES = Counter(
+    "result_cache_misses_total",
+    "Number of uploads NOT found in any result cache (requires backend call)",
+)
+
+BATCH_DURATION = Histogram(
+    "analysis_batch_duration_seconds",
+    "Wall-clock time to analyze a batch of uploaded images",
+    buckets=[0.5, 1.0, 2.0, 5.0, 10.0, 30.0, 60.0, 120.0],
+)
+
+BATCH_SIZE = Histogram(
+    "analysis_batch_size",
+    "Number of images uploaded together in one batch",
+    buckets=[1, 2, 3, 5, 10, 20],
+)
+
+ANALYSES_IN_FLIGHT = Gauge(
+    "backend_analyses_in_flight",
+    "Number of backend analysis calls currently running",
+)
+
 _metrics_server_started = False
 _metrics_server_lock = threading.Lock()
 
@@ -1,5 +1,5 @@
 from pydantic import BaseModel
-from typing import List, Dict
+from typing import List, Dict, Literal
 
 class Assessment(BaseModel):
     rating: str
@@ -7,3 +7,5 @@ class Assessment(BaseModel):
 
 class AnalysisResult(BaseModel):
     assessments: Dict[str, Assessment]
+    status: Literal["complete", "pending", "partial"] = "complete"
+    pending: List[str] = []
@@ -1 +1,4 @@
-from .storage_service import StorageService
\ No newline at end of file
+from .storage_service import StorageService
+from .backend_client import backend_client, BackendClient
+from .result_cache import process_result_cache, ResultCache, content_hash
+from .analysis_service import AnalysisService, Upload, UploadOutcome
\ No newline at end of file
@@ -0,0 +1,124 @@
+import time
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from dataclasses import dataclass, field
+from typing import Dict, Iterator, List, Optional, Tuple
+
+from informed_fe.config.logging import get_logger
+from informed_fe.config.settings import settings
+from informed_fe.metrics import (
+    IMAGE_UPLOADS, IMAGE_SIZE_BYTES, IMAGE_ORIGINAL_SIZE_BYTES, IMAGE_PROCESSING_DURATION,
+    RESULT_CACHE_HITS, RESULT_CACHE_MISSES,
+    BATCH_DURATION, BATCH_SIZE, ANALYSES_IN_FLIGHT,
+)
+from informed_fe.models.schemas import AnalysisResult
+from informed_fe.services.backend_client import backend_client
+from informed_fe.services.result_cache import ResultCache, content_hash, process_result_cache
+from informed_fe.services.storage_service import StorageService
+
+logger = get_logger(__name__)
+
+# Module-level so the pools survive Streamlit reruns and are shared across
+# sessions; the backend pool size is the process-wide limit on concurrent calls.
+_processing_executor = ThreadPoolExecutor(max_workers=settings.IMAGE_PROCESSING_WORKERS, thread_name_prefix="image-processing")
+_backend_executor = ThreadPoolExecutor(max_workers=settings.BACKEND_MAX_CONCURRENCY, thread_name_prefix="backend-call")
+
+
+@dataclass
+class Upload:
+    index: int
+    name: str
+    mime_type: Optional[str]
+    raw_bytes: bytes
+    key: str = field(init=False)
+
+    def __post_init__(self):
+        self.key = content_hash(self.raw_bytes)
+
+
+@dataclass
+class UploadOutcome:
+    upload: Upload
+    result: Optional[AnalysisResult] = None
+    error: Optional[Exception] = None
+
+
+def _process(upload: Upload) -> bytes:
+    logger.info(f"Processing uploaded file: {upload.name}")
+    IMAGE_ORIGINAL_SIZE_BYTES.observe(len(upload.raw_bytes))
+    with IMAGE_PROCESSING_DURATION.time():
+        image_bytes = StorageService.process_bytes(upload.raw_bytes, upload.mime_type, compress=True)
+    logger.debug(f"Image processed, size: {len(image_bytes)} bytes")
+    IMAGE_SIZE_BYTES.observe(len(image_bytes))
+    return image_bytes
+
+
+def _analyze(upload: Upload, image_bytes: bytes) -> AnalysisResult:
+    with ANALYSES_IN_FLIGHT.track_inprogress():
+        # Processing is deterministic, so the backend may already know this exact image.
+        result = backend_client.get_result(content_hash(image_bytes))
+        if result is not None and result.status == "complete":
+            logger.debug(f"Backend already has a result for {upload.name}, skipping upload")
+            return result
+        return backend_client.analyze(upload.name, image_bytes, upload.mime_type)
+
+
+class AnalysisService:
+    @staticmethod
+    def cached_result(upload: Upload, session_cache: ResultCache) -> Optional[AnalysisResult]:
+        """Return a previous result for identical content from the session or process cache."""
+        result = session_cache.get(upload.key)
+        if result is not None:
+            RESULT_CACHE_HITS.labels(layer="session").inc()
+            logger.debug(f"Session cache hit for {upload.name}")
+            return result
+
+        result = process_result_cache.get(upload.key)
+        if result is not None:
+            RESULT_CACHE_HITS.labels(layer="process").inc()
+            logger.debug(f"Process cache hit for {upload.name}")
+            session_cache.put(upload.key, result)
+        return result
+
+    @staticmethod
+    def analyze_batch(uploads: List[Upload], session_cache: ResultCache) -> Iterator[UploadOutcome]:
+        """Analyze uploads concurrently, yielding each outcome as soon as it is ready.
+
+        Compression runs on the image-processing pool; each processed image is
+        then handed to the backend pool, whose size caps concurrent backend calls.
+        """
+        BATCH_SIZE.observe(len(uploads))
+        start = time.perf_counter()
+
+        pending: Dict[Future, Tuple[Upload, str]] = {}
+        try:
+            cached: List[UploadOutcome] = []
+            for upload in uploads:
+                result = AnalysisService.cached_result(upload, session_cache)
+                if result is not None:
+                    cached.append(UploadOutcome(upload, result=result))
+                    continue
+                RESULT_CACHE_MISSES.inc()
+                IMAGE_UPLOADS.inc()
+                pending[_processing_executor.submit(_process, upload)] = (upload, "process")
+
+            # Everything uncached is already submitted, so rendering cached hits does not delay it.
+            yield from cached
+
+            while pending:
+                done, _ = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    upload, stage = pending.pop(future)
+                    error = future.exception()
+                    if error is not None:
+                        yield UploadOutcome(upload, error=error)
+                    elif stage == "process":
+                        pending[_backend_executor.submit(_analyze, upload, future.result())] = (upload, "analyze")
+                    else:
+                        result = future.result()
+                        # Pending/partial results are finished by the backend later, so only complete ones are reusable.
+                        if result.status == "complete":
+                            process_result_cache.put(upload.key, result)
+                            session_cache.put(upload.key, result)
+                        yield UploadOutcome(upload, result=result)
+        finally:
+            BATCH_DURATION.observe(time.perf_counter() - start)
@@ -0,0 +1,62 @@
+from typing import Optional
+
+import requests
+from requests.adapters import HTTPAdapter
+
+from informed_fe.config.logging import get_logger
+from informed_fe.config.settings import settings
+from informed_fe.metrics import BACKEND_API_REQUESTS, BACKEND_API_ERRORS, BACKEND_API_DURATION
+from informed_fe.models.schemas import AnalysisResult
+
+logger = get_logger(__name__)
+
+
+class BackendClient:
+    """Backend API client reusing pooled keep-alive connections across Streamlit reruns."""
+
+    def __init__(self, base_url: str):
+        self.base_url = base_url
+        self.timeout = (settings.BACKEND_CONNECT_TIMEOUT_SECONDS, settings.BACKEND_READ_TIMEOUT_SECONDS)
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=settings.BACKEND_POOL_SIZE)
+        self.session.mount("http://", adapter)
+        self.session.mount("https://", adapter)
+
+    def analyze(self, file_name: str, image_bytes: bytes, mime_type: Optional[str]) -> AnalysisResult:
+        logger.info(f"Sending request to backend: {self.base_url}/analyze")
+        BACKEND_API_REQUESTS.inc()
+
+        try:
+            with BACKEND_API_DURATION.time():
+                response = self.session.post(
+                    f"{self.base_url}/analyze",
+                    files={"file": (file_name, image_bytes, mime_type)},
+                    timeout=self.timeout,
+                )
+                response.raise_for_status()
+        except requests.exceptions.RequestException as e:
+            error_type = type(e).__name__
+            BACKEND_API_ERRORS.labels(error_type=error_type).inc()
+            logger.error(f"API call failed: {str(e)}")
+            raise
+
+        logger.info(f"Backend response received: {response.status_code}")
+        return AnalysisResult(**response.json())
+
+    def get_result(self, image_hash: str) -> Optional[AnalysisResult]:
+        """Fetch an existing analysis by image hash; None if the backend has none (or cannot be asked)."""
+        BACKEND_API_REQUESTS.inc()
+        try:
+            with BACKEND_API_DURATION.time():
+                response = self.session.get(f"{self.base_url}/results/{image_hash}", timeout=self.timeout)
+            if response.status_code == 404:
+                return None
+            response.raise_for_status()
+            return AnalysisResult(**response.json())
+        except (requests.exceptions.RequestException, ValueError) as e:
+            BACKEND_API_ERRORS.labels(error_type=type(e).__name__).inc()
+            logger.warning(f"Result lookup failed, falling back to upload: {str(e)}")
+            return None
+
+
+backend_client = BackendClient(settings.INFORMED_BE_URL)
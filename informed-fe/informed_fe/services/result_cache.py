@@ -0,0 +1,42 @@
+import hashlib
+import threading
+from collections import OrderedDict
+from typing import Generic, Optional, TypeVar
+
+from informed_fe.config.settings import settings
+
+T = TypeVar("T")
+
+
+def content_hash(data: bytes) -> str:
+    return hashlib.sha256(data).hexdigest()
+
+
+class ResultCache(Generic[T]):
+    """Thread-safe bounded LRU cache keyed by upload content hash."""
+
+    def __init__(self, max_entries: int):
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[str, T]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: str) -> Optional[T]:
+        with self._lock:
+            value = self._entries.get(key)
+            if value is not None:
+                self._entries.move_to_end(key)
+            return value
+
+    def put(self, key: str, value: T) -> None:
+        if self.max_entries <= 0:
+            return
+        with self._lock:
+            self._entries[key] = value
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+
+# Shared by every Streamlit session in this process; survives script reruns
+# because modules are only imported once.
+process_result_cache: ResultCache = ResultCache(settings.RESULT_CACHE_MAX_ENTRIES)
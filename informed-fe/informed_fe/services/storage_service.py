@@ -1,7 +1,7 @@
 from io import BytesIO
 from typing import Optional
 
-from PIL import Image
+from PIL import Image, ImageOps
 
 from informed_fe.config.logging import get_logger
 from informed_fe.config.settings import settings
@@ -11,19 +11,68 @@ logger = get_logger(__name__)
 class StorageService:
     @staticmethod
     def process_image(file, compress: bool = True, quality: int = 85) -> bytes:
-        image_bytes = file.read()
+        return StorageService.process_bytes(file.read(), getattr(file, "type", None), compress, quality)
+
+    @staticmethod
+    def process_bytes(image_bytes: bytes, mime_type: Optional[str], compress: bool = True, quality: int = 85) -> bytes:
         if not image_bytes:
             logger.warning("Empty file uploaded")
             raise ValueError("Empty file uploaded")
 
-        mime_type: Optional[str] = getattr(file, "type", None)
         if mime_type and not mime_type.startswith("image/"):
             logger.warning(f"Invalid image file type: {mime_type}")
             raise ValueError("File must be an image (e.g., JPEG, PNG)")
 
-        if len(image_bytes) > settings.MAX_UPLOAD_SIZE_MB * 1024 * 1024:
-            raise ValueError(f"File size exceeds {settings.MAX_UPLOAD_SIZE_MB}MB limit")
+        # Camera photos shrink a lot when downscaled, so only the processed image must fit the upload limit.
+        if len(image_bytes) > settings.MAX_INPUT_SIZE_MB * 1024 * 1024:
+            raise ValueError(f"File size exceeds {settings.MAX_INPUT_SIZE_MB}MB limit")
+
+        if not compress:
+            StorageService._validate(image_bytes)
+            processed = image_bytes
+        else:
+            with BytesIO(image_bytes) as input_io:
+                with StorageService._open(input_io) as img:
+                    img_format = img.format
+                    img = StorageService._resize(img)
+                    processed = StorageService._encode(img, img_format, mime_type, quality)
+
+        if len(processed) > settings.MAX_UPLOAD_SIZE_MB * 1024 * 1024:
+            raise ValueError(f"Processed image exceeds {settings.MAX_UPLOAD_SIZE_MB}MB limit")
+        return processed
 
+    @staticmethod
+    def _open(input_io: BytesIO) -> Image.Image:
+        """Open and fully decode an image, so a single decode both validates and feeds compression."""
+        try:
+            img = Image.open(input_io)
+            max_edge = settings.IMAGE_MAX_LONG_EDGE
+            if max_edge > 0:
+                # JPEG decoders can scale by 1/2..1/8 while decoding, which is far cheaper than resampling.
+                img.draft("L" if settings.IMAGE_GRAYSCALE else img.mode, (max_edge, max_edge))
+            img.load()
+            return img
+        except Exception as e:
+            logger.warning(f"Invalid image: {str(e)}")
+            raise ValueError("Uploaded file is not a valid image")
+
+    @staticmethod
+    def _resize(img: Image.Image) -> Image.Image:
+        """Apply EXIF orientation and shrink to IMAGE_MAX_LONG_EDGE so OCR sees upright text at a useful size."""
+        img = ImageOps.exif_transpose(img)
+
+        max_edge = settings.IMAGE_MAX_LONG_EDGE
+        if max_edge > 0 and max(img.size) > max_edge:
+            original_size = img.size
+            img.thumbnail((max_edge, max_edge), Image.Resampling.BILINEAR, reducing_gap=2.0)
+            logger.debug(f"Resized image from {original_size} to {img.size}")
+
+        if settings.IMAGE_GRAYSCALE and img.mode != "L":
+            img = img.convert("L")
+        return img
+
+    @staticmethod
+    def _validate(image_bytes: bytes) -> None:
         try:
             with BytesIO(image_bytes) as input_io:
                 with Image.open(input_io) as img_probe:
@@ -32,30 +81,28 @@ class StorageService:
             logger.warning(f"Invalid image: {str(e)}")
             raise ValueError("Uploaded file is not a valid image")
 
-        if compress:
-            try:
-                with BytesIO(image_bytes) as input_io, BytesIO() as output_io:
-                    with Image.open(input_io) as img:
-                        img_format = (img.format or "").upper()
-
-                        if not img_format:
-                            if mime_type and "/" in mime_type:
-                                subtype = mime_type.split("/", 1)[1].upper()
-                                img_format = "JPEG" if subtype in {"JPG", "JPEG"} else subtype
-                            else:
-                                img_format = "JPEG"
-
-                        if img_format in {"JPG", "JPEG"} and img.mode not in {"RGB", "L"}:
-                            img = img.convert("RGB")
-
-                        save_kwargs = {"optimize": True}
-                        if img_format in {"JPG", "JPEG"}:
-                            save_kwargs["quality"] = quality
-
-                        img.save(output_io, format="JPEG" if img_format == "JPG" else img_format, **save_kwargs)
-                        image_bytes = output_io.getvalue()
-            except Exception as e:
-                logger.error(f"Compression failed: {str(e)}")
-                raise ValueError(f"Image compression failed: {str(e)}")
-
-        return image_bytes
+    @staticmethod
+    def _encode(img: Image.Image, img_format: Optional[str], mime_type: Optional[str], quality: int) -> bytes:
+        try:
+            with BytesIO() as output_io:
+                img_format = (img_format or "").upper()
+
+                if not img_format:
+                    if mime_type and "/" in mime_type:
+                        subtype = mime_type.split("/", 1)[1].upper()
+                        img_format = "JPEG" if subtype in {"JPG", "JPEG"} else subtype
+                    else:
+                        img_format = "JPEG"
+
+                if img_format in {"JPG", "JPEG"} and img.mode not in {"RGB", "L"}:
+                    img = img.convert("RGB")
+
+                save_kwargs = {"optimize": True}
+                if img_format in {"JPG", "JPEG"}:
+                    save_kwargs["quality"] = quality
+
+                img.save(output_io, format="JPEG" if img_format == "JPG" else img_format, **save_kwargs)
+                return output_io.getvalue()
+        except Exception as e:
+            logger.error(f"Compression failed: {str(e)}")
+            raise ValueError(f"Image compression failed: {str(e)}")